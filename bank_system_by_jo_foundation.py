@@ -27,7 +27,7 @@ Features:
 - Withdraw (with balance checks)
 - Check balance
 - Transaction history per account
-- Persistence to JSON (accounts.json)
+- Persistence to JSON (one snapshot per account in accounts/ + accounts.ndjson ledger)
 Security:
 - PINs are stored as SHA-256 hashes (not plain text) for minimal security awareness.
 Usage:
@@ -35,26 +35,101 @@ Usage:
 - A simple CLI demo is included under `if __name__ == '__main__'`.
 """
 
+import atexit
+import base64
+import calendar
+import contextlib
+import functools
+import hmac
 import json
+import math
+import mmap
 import os
-from dataclasses import dataclass, asdict, field
-from typing import Dict, List, Optional
+import re
+import shutil
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 import hashlib
-import datetime
+import time
+
+try:
+    import msgspec  # !pip install msgspec  # optional, the fastest encoder; used before orjson
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson  # !pip install orjson  # optional, several times faster than json
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # optional, vectorises the transaction aggregates
+except ImportError:
+    np = None
 
 ACCOUNTS_FILE = '/content/accounts.json'  # In Colab this path will persist for the session only
+SNAPSHOT_EVERY = 1000  # ledger records appended before the snapshot is rewritten
+IO_BUFFER_SIZE = 1 << 18  # 256 KiB snapshot write buffer, well past io.DEFAULT_BUFFER_SIZE
+ACCOUNT_SHARDS = 256  # power of two, see AccountManager._bucket()
+LOG_BUFFER_SIZE = 1 << 17  # ledger handle; flushed after every record anyway
+DEPOSIT = sys.intern("deposit")
+WITHDRAW = sys.intern("withdraw")
+TX_TYPES = (DEPOSIT, WITHDRAW)  # stored as their index in TransactionLog
+TX_CODES = {t: i for i, t in enumerate(TX_TYPES)}
+_PIN_RE = re.compile(r'\d{4}', re.ASCII)  # ASCII so e.g. Arabic-Indic digits are rejected
+
+
+@functools.lru_cache(maxsize=1024)
+def digest_pin(pin: str) -> bytes:
+    """Return the raw SHA-256 digest of the PIN string."""
+    return hashlib.sha256(pin.encode('utf-8')).digest()
+
 
+def encode_digest(digest: bytes) -> str:
+    """Text form of a PIN digest for the JSON files."""
+    return base64.b64encode(digest).decode('ascii')
 
-def hash_pin(pin: str) -> str:
-    """Return SHA-256 hash of the PIN string."""
-    return hashlib.sha256(pin.encode('utf-8')).hexdigest()
 
+def decode_digest(info: Dict) -> bytes:
+    """Read a PIN digest from a stored record, accepting the older hex 'pin_hash' key."""
+    if 'pin' in info:
+        return base64.b64decode(info['pin'])
+    return bytes.fromhex(info['pin_hash'])
 
-def now_iso():
-    return datetime.datetime.utcnow().isoformat() + 'Z'
 
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using msgspec or orjson when one is installed."""
+    if msgspec is not None:
+        buf = msgspec.json.encode(obj)
+        return msgspec.json.format(buf, indent=2) if indent else buf
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
 
-@dataclass
+
+def json_loads(data):
+    """Parse JSON from bytes or any buffer, e.g. a memoryview of an mmap."""
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return orjson.loads(data) if orjson is not None else json.loads(bytes(data))
+
+
+def format_ts(ns: int) -> str:
+    """Format a UTC epoch timestamp in nanoseconds as ISO 8601 with microseconds."""
+    secs, frac = divmod(ns, 1_000_000_000)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(secs)) + f'.{frac // 1000:06d}Z'
+
+
+def parse_ts(s: str) -> int:
+    """Inverse of format_ts for the ISO 8601 'Z' timestamps written by older versions."""
+    base, _, frac = s.rstrip('Z').partition('.')
+    secs = calendar.timegm(time.strptime(base, '%Y-%m-%dT%H:%M:%S'))
+    return secs * 1_000_000_000 + int(frac.ljust(6, '0')[:6]) * 1000
+
+
+@dataclass(slots=True)
 class Transaction:
     timestamp: str
     type: str  # "deposit" or "withdraw"
@@ -63,89 +138,442 @@ class Transaction:
     note: Optional[str] = None
 
 
-@dataclass
+class TransactionLog:
+    """Transaction history of one account, stored column-wise.
+
+    Each field lives in its own compact array instead of one dict per
+    transaction; rows are only turned into dicts when they are read.
+    """
+
+    __slots__ = ('ts', 'types', 'amounts', 'balances', 'notes')
+
+    def __init__(self):
+        self.ts = array('q')  # UTC epoch nanoseconds
+        self.types = bytearray()  # index into TX_TYPES
+        self.amounts = array('d')
+        self.balances = array('d')
+        self.notes: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __iter__(self):
+        return (self._row(*r) for r in zip(self.ts, self.types, self.amounts, self.balances, self.notes))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TransactionLog):
+            return NotImplemented
+        return self.to_columns() == other.to_columns()
+
+    def __repr__(self) -> str:
+        return f'TransactionLog({len(self)} transactions)'
+
+    @staticmethod
+    def _row(ts: int, code: int, amount: float, balance: float, note: Optional[str]) -> Dict:
+        return {'timestamp': format_ts(ts), 'type': TX_TYPES[code], 'amount': amount,
+                'balance_after': balance, 'note': note}
+
+    def append(self, ts: int, type: str, amount: float, balance_after: float, note: Optional[str] = None):
+        self.ts.append(ts)
+        self.types.append(TX_CODES[type])
+        self.amounts.append(amount)
+        self.balances.append(balance_after)
+        self.notes.append(note)
+
+    def append_dict(self, tx: Dict):
+        """Append a transaction in the old one-dict-per-transaction format."""
+        self.append(parse_ts(tx['timestamp']), tx['type'], tx['amount'], tx['balance_after'], tx.get('note'))
+
+    def append_record(self, rec: List):
+        """Append a transaction from its compact [ts, type_code, amount, balance_after, note] form."""
+        ts, code, amount, balance, note = rec
+        # convert up front so a malformed row fails before any column is touched
+        self.append(int(ts), TX_TYPES[code], float(amount), float(balance), note)
+
+    def record(self, i: int) -> List:
+        return [self.ts[i], self.types[i], self.amounts[i], self.balances[i], self.notes[i]]
+
+    def tail(self, n: int) -> List[Dict]:
+        """Return the last n transactions as dicts, newest first."""
+        if n <= 0:
+            return []
+        start = max(len(self) - n, 0)
+        rows = list(zip(self.ts[start:], self.types[start:], self.amounts[start:], self.balances[start:], self.notes[start:]))
+        return [self._row(*r) for r in reversed(rows)]
+
+    def total_by_type(self) -> Dict[str, float]:
+        """Return the summed amount per transaction type."""
+        if np is not None and len(self):
+            codes = np.frombuffer(self.types, dtype=np.uint8)
+            amounts = np.frombuffer(self.amounts, dtype=np.float64)
+            totals = np.bincount(codes, weights=amounts, minlength=len(TX_TYPES)).tolist()
+        else:
+            totals = [0.0] * len(TX_TYPES)
+            for code, amount in zip(self.types, self.amounts):
+                totals[code] += amount
+        return dict(zip(TX_TYPES, totals))
+
+    def rolling_balance(self, window: int) -> List[float]:
+        """Return the mean balance over each run of `window` consecutive transactions."""
+        if window <= 0:
+            raise ValueError("Window must be positive.")
+        if np is not None:
+            if len(self) < window:
+                return []
+            sums = np.cumsum(np.frombuffer(self.balances, dtype=np.float64), dtype=np.float64)
+            sums = np.concatenate(([0.0], sums))
+            return ((sums[window:] - sums[:-window]) / window).tolist()
+        out = []
+        running = 0.0
+        for i, bal in enumerate(self.balances):
+            running += bal
+            if i >= window:
+                running -= self.balances[i - window]
+            if i >= window - 1:
+                out.append(running / window)
+        return out
+
+    def to_columns(self) -> Dict:
+        return {'ts': self.ts.tolist(), 'type': list(self.types), 'amount': self.amounts.tolist(),
+                'balance_after': self.balances.tolist(), 'note': self.notes}
+
+    @classmethod
+    def from_columns(cls, data: Dict) -> 'TransactionLog':
+        log = cls()
+        log.ts.extend(data['ts'])
+        log.types.extend(data['type'])
+        log.amounts.extend(data['amount'])
+        log.balances.extend(data['balance_after'])
+        log.notes.extend(data['note'])
+        return log
+
+    @classmethod
+    def from_dicts(cls, rows: List[Dict]) -> 'TransactionLog':
+        log = cls()
+        for tx in rows:
+            log.append_dict(tx)
+        return log
+
+
+@dataclass(slots=True)
 class BankAccount:
     username: str
-    pin_hash: str
+    pin_digest: bytes = field(repr=False)  # raw SHA-256 of the PIN
     balance: float = 0.0
-    transactions: List[Dict] = field(default_factory=list)
+    transactions: Optional[TransactionLog] = None  # created on the first transaction
+
+    def _history(self) -> TransactionLog:
+        if self.transactions is None:
+            self.transactions = TransactionLog()
+        return self.transactions
+
+    @property
+    def pin_hash(self) -> str:
+        return self.pin_digest.hex()
 
     def check_pin(self, pin: str) -> bool:
-        return self.pin_hash == hash_pin(pin)
+        # constant-time compare so response time doesn't leak how much of the hash matched
+        return hmac.compare_digest(digest_pin(pin), self.pin_digest)
 
     def deposit(self, amount: float, note: Optional[str] = None) -> Transaction:
+        # float() accepts "nan"/"inf", and orjson/msgspec would save those as null
+        if not math.isfinite(amount):
+            raise ValueError("Deposit amount must be a finite number.")
         if amount <= 0:
             raise ValueError("Deposit amount must be positive.")
         self.balance += amount
-        tx = Transaction(timestamp=now_iso(), type="deposit", amount=amount, balance_after=self.balance, note=note)
-        self.transactions.append(asdict(tx))
-        return tx
+        ts = time.time_ns()
+        self._history().append(ts, DEPOSIT, amount, self.balance, note)
+        return Transaction(timestamp=format_ts(ts), type=DEPOSIT, amount=amount, balance_after=self.balance, note=note)
 
     def withdraw(self, amount: float, note: Optional[str] = None) -> Transaction:
+        if not math.isfinite(amount):
+            raise ValueError("Withdraw amount must be a finite number.")
         if amount <= 0:
             raise ValueError("Withdraw amount must be positive.")
         if amount > self.balance:
             raise ValueError("Insufficient funds.")
         self.balance -= amount
-        tx = Transaction(timestamp=now_iso(), type="withdraw", amount=amount, balance_after=self.balance, note=note)
-        self.transactions.append(asdict(tx))
-        return tx
+        ts = time.time_ns()
+        self._history().append(ts, WITHDRAW, amount, self.balance, note)
+        return Transaction(timestamp=format_ts(ts), type=WITHDRAW, amount=amount, balance_after=self.balance, note=note)
 
     def get_balance(self) -> float:
         return self.balance
 
     def get_statement(self, n: int = 10) -> List[Dict]:
-        return list(reversed(self.transactions))[:n]
+        return self.transactions.tail(n) if self.transactions is not None else []
 
 
 class AccountManager:
-    def __init__(self, storage_file: str = ACCOUNTS_FILE):
+    def __init__(self, storage_file: str = ACCOUNTS_FILE, durable: bool = False):
         self.storage_file = storage_file
-        self.accounts: Dict[str, BankAccount] = {}
+        self.durable = durable  # fsync every write; off by default since Colab storage is ephemeral anyway
+        base = os.path.splitext(storage_file)[0]
+        # one snapshot file per account, see _account_path(); never the storage_file itself
+        self.accounts_dir = base if base != storage_file else storage_file + '.d'
+        self.log_file = base + '.ndjson'
+        # split by hash so no single dict grows huge, and so each shard could get its own lock later
+        self.accounts: List[Dict[str, BankAccount]] = [{} for _ in range(ACCOUNT_SHARDS)]
         self.logged_in: Optional[BankAccount] = None
+        self._dirty: set[str] = set()
+        self._log_count = 0
+        self._snapshot_every = SNAPSHOT_EVERY
+        self._log_fh = None
+        self._log_corrupt = False
+        self._log_damaged = False
+        self._gaps: set[str] = set()
+        self._legacy_loaded = False
+        self._paths: Dict[str, Tuple[str, str]] = {}  # username -> (snapshot path, temp path)
+        self._stamps: Dict[str, Tuple[int, int]] = {}  # username -> (mtime_ns, size) of the snapshot we last read or wrote
         self.load()
+        # created once here rather than on every save; also creates the ledger's directory
+        os.makedirs(self.accounts_dir, exist_ok=True)
+        self._log_fh = open(self.log_file, 'ab', buffering=LOG_BUFFER_SIZE)
+        if self._log_damaged:
+            # compacting drops the records that could not be replayed; keep them for manual recovery
+            kept = f'{self.log_file}.{time.time_ns()}.bad'
+            shutil.copyfile(self.log_file, kept)
+            print(f"[WARN] {self.log_file} is damaged before its last record; copied to {kept}")
+        if self._log_corrupt or self._log_damaged:
+            self.save()  # compact so new records are not appended after a torn line
+        atexit.register(self.close)
+
+    def _bucket(self, username: str) -> Dict[str, BankAccount]:
+        return self.accounts[hash(username) & (ACCOUNT_SHARDS - 1)]
+
+    def _account_path(self, username: str) -> Tuple[str, str]:
+        """Return the account's snapshot path and the temp path used to write it."""
+        paths = self._paths.get(username)
+        if paths is None:
+            # named by a hash so any username fits in a file name and case-insensitive
+            # filesystems can't merge "Alice" and "alice"; the username is stored inside
+            path = os.path.join(self.accounts_dir, hashlib.sha256(username.encode('utf-8')).hexdigest() + '.json')
+            paths = self._paths[username] = (path, path + '.tmp')  # same directory, so os.replace() stays atomic
+        return paths
+
+    @staticmethod
+    def _read_json(path: str):
+        # parse straight from the mapped pages instead of copying the file into a bytes object
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return json_loads(view)
+
+    @staticmethod
+    def _account_from(username: str, info: Dict) -> BankAccount:
+        if 'tx' in info:
+            txs = TransactionLog.from_columns(info['tx'])
+        elif info.get('transactions'):
+            txs = TransactionLog.from_dicts(info['transactions'])
+        else:
+            txs = None
+        return BankAccount(username=username, pin_digest=decode_digest(info), balance=info.get('balance', 0.0), transactions=txs)
 
     def load(self):
         if os.path.exists(self.storage_file):
+            # single-file snapshot from older versions; split into accounts_dir on the next save
             try:
-                with open(self.storage_file, 'r') as f:
-                    data = json.load(f)
-                for username, info in data.items():
-                    acc = BankAccount(username=username, pin_hash=info['pin_hash'], balance=info.get('balance', 0.0), transactions=info.get('transactions', []))
-                    self.accounts[username] = acc
+                data = self._read_json(self.storage_file)
+                legacy = {username: self._account_from(username, info) for username, info in data.items()}
             except Exception as e:
                 print(f"[WARN] Failed to load accounts from {self.storage_file}: {e}")
+            else:
+                for username, acc in legacy.items():
+                    self._bucket(username)[username] = acc
+                    self._dirty.add(username)
+                self._legacy_loaded = True
+        if os.path.isdir(self.accounts_dir):
+            for entry in os.scandir(self.accounts_dir):
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    info = self._read_json(entry.path)
+                    username = info['username']
+                    acc = self._account_from(username, info)
+                except Exception as e:
+                    print(f"[WARN] Failed to load account from {entry.path}: {e}")
+                    continue
+                self._bucket(username)[username] = acc
+                self._paths[username] = (entry.path, entry.path + '.tmp')
+                st = entry.stat()
+                self._stamps[username] = (st.st_mtime_ns, st.st_size)
+                self._dirty.discard(username)
+        self._replay_log()
+
+    def _replay_log(self):
+        """Apply ledger records written since the last snapshot."""
+        self._log_corrupt = False  # torn last line, e.g. a crash mid-write; safe to compact
+        self._log_damaged = False  # bad record with more after it; later records may be lost
+        self._gaps.clear()
+        if not os.path.exists(self.log_file) or not os.path.getsize(self.log_file):
+            return  # mmap cannot map an empty file, and an empty ledger has nothing to replay
+        with open(self.log_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                torn = not line.endswith(b'\n')  # only ever the last line
+                if torn:
+                    self._log_corrupt = True
+                try:
+                    self._apply_record(json_loads(line))
+                except (ValueError, KeyError, TypeError, IndexError):
+                    # after a torn write everything before it is still good; anywhere else it is damage
+                    print(f"[WARN] Skipping unreadable record in {self.log_file}")
+                    if not torn:
+                        self._log_damaged = True
+                    continue
+                self._log_count += 1
+        if self._gaps:
+            print(f"[WARN] Records missing from {self.log_file}; later transactions not replayed for: "
+                  + ', '.join(sorted(self._gaps)))
+            self._log_damaged = True
+
+    def _apply_record(self, rec: Dict):
+        username = rec['u']
+        if 'tx' not in rec:  # account creation
+            bucket = self._bucket(username)
+            if username not in bucket:
+                bucket[username] = BankAccount(username=username, pin_digest=decode_digest(rec))
+                self._dirty.add(username)
+            return
+        acc = self._bucket(username).get(username)
+        n = len(acc.transactions or ()) if acc is not None else 0
+        # records already covered by the snapshot are skipped by their sequence number
+        if acc is not None and rec['n'] < n:
+            return
+        if acc is None or rec['n'] > n:
+            self._gaps.add(username)  # an earlier record for this account went missing
+            return
+        acc._history().append_record(rec['tx'])
+        acc.balance = acc.transactions.balances[-1]
+        self._dirty.add(username)
+
+    @staticmethod
+    def _fsync_dir(path: str):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _adopt_newer(self, acc: BankAccount, path: str) -> bool:
+        """Take over the account's snapshot if another manager has since written a longer history.
+
+        Several managers can share one storage_file (e.g. the notebook's mgr and mgr_test),
+        and atexit closes the oldest last; without this its stale copy would win.
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._stamps.get(acc.username) == stamp:
+            return False  # still the file we last read or wrote
+        try:
+            disk = self._account_from(acc.username, self._read_json(path))
+        except Exception:
+            return False  # unreadable, so ours replaces it
+        if len(disk.transactions or ()) <= len(acc.transactions or ()):
+            return False
+        print(f"[WARN] {path} has a newer history for {acc.username}; keeping it")
+        # updated in place so logged_in keeps pointing at the live account
+        acc.balance, acc.transactions = disk.balance, disk.transactions
+        self._stamps[acc.username] = stamp
+        return True
 
     def save(self):
-        data = {}
-        for username, acc in self.accounts.items():
-            data[username] = {
-                'pin_hash': acc.pin_hash,
+        """Snapshot the accounts changed since the last save and truncate the ledger."""
+        for username in self._dirty:
+            acc = self._bucket(username)[username]
+            path, tmp_path = self._account_path(username)
+            if self._adopt_newer(acc, path):
+                continue
+            data = {
+                'username': username,
+                'pin': encode_digest(acc.pin_digest),
                 'balance': acc.balance,
-                'transactions': acc.transactions
             }
-        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-        with open(self.storage_file, 'w') as f:
-            json.dump(data, f, indent=2)
-        return self.storage_file
+            if acc.transactions is not None:
+                data['tx'] = acc.transactions.to_columns()
+            # write to a temp file, then atomically swap it in
+            with open(tmp_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                f.write(json_dumps(data, indent=True))
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            st = os.stat(path)
+            self._stamps[username] = (st.st_mtime_ns, st.st_size)
+        if self.durable and self._dirty:
+            # the renames must be on disk before the ledger records they replace are dropped
+            self._fsync_dir(self.accounts_dir)
+        if self._legacy_loaded:
+            # every account from the old single file now has its own snapshot;
+            # another manager on the same file may have removed it already
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.storage_file)
+            self._legacy_loaded = False
+        if self._log_fh is not None:
+            self._log_fh.truncate(0)
+            if self.durable:
+                os.fsync(self._log_fh.fileno())
+        self._log_count = 0
+        self._dirty.clear()
+        return self.accounts_dir
+
+    def _append(self, username: str, record: Dict):
+        # the change is already in memory; marked first so a failed write still reaches the next snapshot
+        self._dirty.add(username)
+        self._log_fh.write(json_dumps(record) + b'\n')
+        self._log_fh.flush()
+        if self.durable:
+            os.fsync(self._log_fh.fileno())
+        self._log_count += 1
+        if self._log_count >= self._snapshot_every:
+            try:
+                self.save()
+            except OSError as e:
+                # the record is already in the ledger; the next save retries the snapshot
+                print(f"[WARN] Snapshot to {self.accounts_dir} failed: {e}")
+
+    def _append_tx(self, username: str):
+        """Log the account's latest transaction."""
+        txs = self._bucket(username)[username].transactions
+        n = len(txs) - 1
+        self._append(username, {'u': username, 'n': n, 'tx': txs.record(n)})
+
+    def flush(self):
+        """Fold pending ledger records into the snapshot, if any."""
+        if self._dirty or self._log_count:
+            self.save()
+
+    def close(self):
+        if self._log_fh is None:
+            return
+        self.flush()
+        self._log_fh.close()
+        self._log_fh = None
+        atexit.unregister(self.close)
 
     def create_account(self, username: str, pin: str, initial_deposit: float = 0.0) -> BankAccount:
-        if username in self.accounts:
+        bucket = self._bucket(username)
+        if username in bucket:
             raise ValueError("Username already exists.")
-        if not (pin.isdigit() and len(pin) == 4):
+        if _PIN_RE.fullmatch(pin) is None:
             raise ValueError("PIN must be 4 digits.")
+        if not math.isfinite(initial_deposit):
+            raise ValueError("Initial deposit must be a finite number.")
         if initial_deposit < 0:
             raise ValueError("Initial deposit cannot be negative.")
-        acc = BankAccount(username=username, pin_hash=hash_pin(pin), balance=float(initial_deposit))
+        acc = BankAccount(username=username, pin_digest=digest_pin(pin))
         if initial_deposit > 0:
             # record initial deposit transaction
-            acc.transactions.append(asdict(Transaction(timestamp=now_iso(), type="deposit", amount=initial_deposit, balance_after=acc.balance, note="initial_deposit")))
-        self.accounts[username] = acc
-        self.save()
+            acc.deposit(float(initial_deposit), note="initial_deposit")
+        bucket[username] = acc
+        self._append(username, {'u': username, 'pin': encode_digest(acc.pin_digest)})
+        if acc.transactions:
+            self._append_tx(username)
         return acc
 
     def login(self, username: str, pin: str) -> BankAccount:
-        acc = self.accounts.get(username)
+        acc = self._bucket(username).get(username)
         if acc is None:
             raise ValueError("Account not found.")
         if not acc.check_pin(pin):
@@ -160,14 +588,14 @@ class AccountManager:
         if not self.logged_in:
             raise RuntimeError("No user logged in.")
         tx = self.logged_in.deposit(amount, note=note)
-        self.save()
+        self._append_tx(self.logged_in.username)
         return tx
 
     def withdraw_logged(self, amount: float, note: Optional[str] = None) -> Transaction:
         if not self.logged_in:
             raise RuntimeError("No user logged in.")
         tx = self.logged_in.withdraw(amount, note=note)
-        self.save()
+        self._append_tx(self.logged_in.username)
         return tx
 
     def get_balance_logged(self) -> float:
@@ -182,63 +610,103 @@ class AccountManager:
 
 
 # Simple CLI demo (useful when run as script or in a cell)
-def cli_demo():
-    mgr = AccountManager()
-    print("=== Bank System by Jo Foundation — CLI Demo ===")
-    while True:
-        print("\\nOptions: [1] Create [2] Login [3] Exit")
-        cmd = input("Choose: ").strip()
-        if cmd == '1':
-            uname = input("Choose username: ").strip()
-            pin = input("Choose 4-digit PIN: ").strip()
-            dep = float(input("Initial deposit (0 if none): ").strip() or 0)
-            try:
-                mgr.create_account(uname, pin, dep)
-                print("Account created.")
-            except Exception as e:
-                print("Error:", e)
-        elif cmd == '2':
-            uname = input("Username: ").strip()
-            pin = input("PIN: ").strip()
+class BankCLI:
+    """Menu loop over an AccountManager, dispatching through per-menu jump tables.
+
+    Reads answers from `lines` when given (scripted use), otherwise from input().
+    """
+
+    def __init__(self, mgr: AccountManager, lines: Optional[Iterable[str]] = None):
+        self.mgr = mgr
+        self._lines = iter(lines) if lines is not None else None
+        self._running = True
+        self._handlers = {'1': self._create, '2': self._login_flow, '3': self._exit}
+        self._account_handlers = {'1': self._balance, '2': self._deposit, '3': self._withdraw,
+                                  '4': self._statement, '5': self._logout}
+
+    def _ask(self, prompt: str) -> str:
+        if self._lines is None:
+            return input(prompt).strip()
+        sys.stdout.write(prompt)
+        sys.stdout.flush()  # once per prompt, i.e. once per menu frame
+        line = next(self._lines, None)
+        if line is None:
+            raise EOFError
+        return line.strip()
+
+    @staticmethod
+    def _say(*lines: str):
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+    def run(self):
+        self._say("=== Bank System by Jo Foundation — CLI Demo ===")
+        try:
+            while self._running:
+                self._say("", "Options: [1] Create [2] Login [3] Exit")
+                self._handlers.get(self._ask("Choose: "), self._unknown)()
+        except EOFError:
+            pass  # ran out of input
+
+    def _unknown(self):
+        self._say("Unknown option.")
+
+    def _create(self):
+        uname = self._ask("Choose username: ")
+        pin = self._ask("Choose 4-digit PIN: ")
+        try:
+            dep = float(self._ask("Initial deposit (0 if none): ") or 0)
+            self.mgr.create_account(uname, pin, dep)
+            self._say("Account created.")
+        except (ValueError, OSError) as e:  # OSError: the ledger write failed
+            self._say(f"Error: {e}")
+
+    def _exit(self):
+        self._say("Goodbye.")
+        self._running = False
+
+    def _login_flow(self):
+        uname = self._ask("Username: ")
+        pin = self._ask("PIN: ")
+        try:
+            acc = self.mgr.login(uname, pin)
+        except ValueError as e:
+            self._say(f"Login failed: {e}")
+            return
+        self._say(f"Logged in as {acc.username}. Balance: {acc.balance}", "")
+        while self.mgr.logged_in is not None:
+            self._say("", "[1] Balance  [2] Deposit [3] Withdraw [4] Statement [5] Logout", "")
+            handler = self._account_handlers.get(self._ask("Choose: "), self._unknown)
             try:
-                acc = mgr.login(uname, pin)
-                print(f"Logged in as {acc.username}. Balance: {acc.balance}\n")
-                while True:
-                    print("n[1] Balance  [2] Deposit [3] Withdraw [4] Statement [5] Logout\n")
-                    c2 = input("Choose: ").strip()
-                    if c2 == '1':
-                        print("Balance:", mgr.get_balance_logged())
-                    elif c2 == '2':
-                        amt = float(input("Amount to deposit: ").strip())
-                        mgr.deposit_logged(amt)
-                        print("Deposited.", "Balance:", mgr.get_balance_logged())
-                    elif c2 == '3':
-                        amt = float(input("Amount to withdraw: ").strip())
-                        try:
-                            mgr.withdraw_logged(amt)
-                            print("Withdrawn.", "Balance:", mgr.get_balance_logged())
-                        except Exception as e:
-                            print("Error:", e)
-                    elif c2 == '4':
-                        for tx in mgr.get_statement_logged(20):
-                            print(tx)
-                    elif c2 == '5':
-                        mgr.logout()
-                        print("Logged out.")
-                        break
-                    else:
-                        print("Unknown option.")
-            except Exception as e:
-                print("Login failed:", e)
-        elif cmd == '3':
-            print("Goodbye.")
-            break
-        else:
-            print("Unknown option.")
+                handler()
+            except (ValueError, RuntimeError, OSError) as e:  # not Exception, so EOFError still ends the loop
+                self._say(f"Error: {e}")
+
+    def _balance(self):
+        self._say(f"Balance: {self.mgr.get_balance_logged()}")
+
+    def _deposit(self):
+        self.mgr.deposit_logged(float(self._ask("Amount to deposit: ")))
+        self._say(f"Deposited. Balance: {self.mgr.get_balance_logged()}")
+
+    def _withdraw(self):
+        self.mgr.withdraw_logged(float(self._ask("Amount to withdraw: ")))
+        self._say(f"Withdrawn. Balance: {self.mgr.get_balance_logged()}")
+
+    def _statement(self):
+        self._say(*(str(tx) for tx in self.mgr.get_statement_logged(20)))
+
+    def _logout(self):
+        self.mgr.logout()
+        self._say("Logged out.")
+
+
+def cli_demo(lines: Optional[Iterable[str]] = None):
+    BankCLI(AccountManager(), lines).run()
 
 
 if __name__ == '__main__':
-    cli_demo()
+    # `python bank_system_by_jo_foundation.py --stdin < script.txt` replays a scripted session
+    cli_demo(sys.stdin.read().splitlines() if '--stdin' in sys.argv[1:] else None)
 
 # Step 2 — Launch UI in Colab
 